@@ -1,7 +1,9 @@
+import asyncio
 from fastapi import FastAPI
 from app.log_config import LOGGING_CONFIG
 import logging.config
 from fastapi.middleware.cors import CORSMiddleware
+from app.helpers.mongodb import ensure_message_indexes
 
 # Import for lifespan event
 from contextlib import asynccontextmanager
@@ -10,13 +12,22 @@ from contextlib import asynccontextmanager
 logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)  # get a logger instance
 
+async def _ensure_indexes():
+    try:
+        await ensure_message_indexes()
+    except Exception as e:
+        logger.error(f"Failed to ensure MongoDB indexes: {e}")
+
 # Lifespan context manager for startup and shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Propensity Score Analysis API")
+    # Create indexes in the background so an unreachable MongoDB doesn't hold up startup
+    index_task = asyncio.create_task(_ensure_indexes())
     yield
     # Shutdown
+    index_task.cancel()
     logger.info("Shutting down Propensity Score Analysis API")
 
 # Create FastAPI app with OpenAPI documentation configuration and lifespan
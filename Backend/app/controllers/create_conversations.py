@@ -6,14 +6,14 @@ import json
 
 async def create_conversation_handler(email):
     try:
-        collection = mongodb.get_collection("conversations")
+        collection = mongodb.get_async_collection("conversations")
         conversation_data = {
             "email": email,
             "created_at": datetime.utcnow(),
             "status": "active",
             "messages": []
         }
-        result = collection.insert_one(conversation_data)
+        result = await collection.insert_one(conversation_data)
         conversation_id = str(result.inserted_id)
         return ConversationResponse(
             conversation_id=conversation_id,
@@ -4,12 +4,37 @@ from app.helpers.mongodb import mongodb
 async def get_conversations():
     try: 
         # Get the conversations collection
-        collection = mongodb.get_collection("conversations")
+        collection = mongodb.get_async_collection("conversations")
         
-        # Fetch all documents and convert ObjectId to string for JSON serialization
-        cursor = collection.find()
+        # Fetch all documents, attaching messages stored in the 'messages' collection
+        # after any legacy messages embedded in the conversation document
+        pipeline = [
+            {
+                "$lookup": {
+                    "from": "messages",
+                    "let": {"conversation_id": "$_id"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$conversation_id", "$$conversation_id"]}}},
+                        {"$sort": {"timestamp": 1, "_id": 1}},
+                        {"$project": {"_id": 0, "conversation_id": 0}}
+                    ],
+                    "as": "stored_messages"
+                }
+            },
+            {
+                "$addFields": {
+                    "messages": {"$concatArrays": [{"$ifNull": ["$messages", []]}, "$stored_messages"]}
+                }
+            },
+            {
+                "$project": {"stored_messages": 0}
+            }
+        ]
+
+        # Convert ObjectId to string for JSON serialization
+        cursor = collection.aggregate(pipeline)
         data = []
-        for doc in cursor:
+        async for doc in cursor:
             doc["_id"] = str(doc["_id"])  # Convert ObjectId to string
             data.append(doc)
         
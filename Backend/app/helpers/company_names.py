@@ -0,0 +1,132 @@
+import re
+from typing import Mapping, Optional
+
+# Company name mappings (lowercase alias -> canonical company name)
+COMPANY_MAPPINGS: Mapping[str, str] = {
+    'youtube': 'YouTube (Google)',
+    'google': 'Google (Alphabet Inc.)',
+    'alphabet': 'Alphabet Inc.',
+    'meta': 'Meta Platforms Inc.',
+    'facebook': 'Meta Platforms Inc.',
+    'apple': 'Apple Inc.',
+    'microsoft': 'Microsoft Corporation',
+    'amazon': 'Amazon.com Inc.',
+    'tesla': 'Tesla Inc.',
+    'nvidia': 'NVIDIA Corporation',
+    'netflix': 'Netflix Inc.',
+    'spotify': 'Spotify Technology S.A.',
+    'uber': 'Uber Technologies Inc.',
+    'airbnb': 'Airbnb Inc.',
+    'twitter': 'X (formerly Twitter)',
+    'x': 'X (formerly Twitter)',
+    'tiktok': 'TikTok (ByteDance)',
+    'bytedance': 'ByteDance Ltd.',
+    'snapchat': 'Snap Inc.',
+    'snap': 'Snap Inc.',
+    'pinterest': 'Pinterest Inc.',
+    'linkedin': 'LinkedIn (Microsoft)',
+    'salesforce': 'Salesforce Inc.',
+    'oracle': 'Oracle Corporation',
+    'ibm': 'IBM Corporation',
+    'intel': 'Intel Corporation',
+    'amd': 'Advanced Micro Devices Inc.',
+    'qualcomm': 'Qualcomm Inc.',
+    'cisco': 'Cisco Systems Inc.',
+    'adobe': 'Adobe Inc.',
+    'paypal': 'PayPal Holdings Inc.',
+    'square': 'Block Inc.',
+    'stripe': 'Stripe Inc.',
+    'zoom': 'Zoom Video Communications Inc.',
+    'slack': 'Slack Technologies Inc.',
+    'dropbox': 'Dropbox Inc.',
+    'box': 'Box Inc.',
+    'atlassian': 'Atlassian Corporation',
+    'servicenow': 'ServiceNow Inc.',
+    'workday': 'Workday Inc.',
+    'snowflake': 'Snowflake Inc.',
+    'databricks': 'Databricks Inc.',
+    'palantir': 'Palantir Technologies Inc.',
+    'crowdstrike': 'CrowdStrike Holdings Inc.',
+    'okta': 'Okta Inc.',
+    'zendesk': 'Zendesk Inc.',
+    'shopify': 'Shopify Inc.',
+    'roku': 'Roku Inc.',
+    'peloton': 'Peloton Interactive Inc.',
+    'docu': 'DocuSign Inc.',
+    'docusign': 'DocuSign Inc.',
+    'twilio': 'Twilio Inc.',
+    'sendgrid': 'Twilio Inc.',
+    'mailchimp': 'Mailchimp (Intuit)',
+    'hubspot': 'HubSpot Inc.',
+    'monday': 'Monday.com Ltd.',
+    'asana': 'Asana Inc.',
+    'trello': 'Atlassian Corporation',
+    'notion': 'Notion Labs Inc.',
+    'airtable': 'Airtable Inc.',
+    'figma': 'Figma Inc.',
+    'canva': 'Canva Pty Ltd.',
+    'grammarly': 'Grammarly Inc.',
+    'lastpass': 'LogMeIn Inc.',
+    '1password': '1Password Inc.',
+    'dashlane': 'Dashlane Inc.',
+    'bitwarden': 'Bitwarden Inc.',
+    'expressvpn': 'ExpressVPN (Kape Technologies)',
+    'nordvpn': 'NordVPN (Nord Security)',
+    'surfshark': 'Surfshark (Nord Security)',
+    'proton': 'Proton AG',
+    'protonmail': 'Proton AG',
+    'protonvpn': 'Proton AG',
+    'tutanota': 'Tutanota GmbH',
+    'signal': 'Signal Foundation',
+    'telegram': 'Telegram FZ-LLC',
+    'whatsapp': 'WhatsApp (Meta)',
+    'discord': 'Discord Inc.',
+    'teams': 'Microsoft Teams (Microsoft)',
+    'webex': 'Webex (Cisco)',
+    'gotomeeting': 'GoTo Meeting (LogMeIn)',
+    'bluejeans': 'BlueJeans (Verizon)',
+    'jitsi': 'Jitsi (8x8)',
+    'whereby': 'Whereby (Videxio AS)',
+    'calendly': 'Calendly Inc.',
+    'acuity': 'Acuity Scheduling Inc.',
+    'doodle': 'Doodle AG',
+    'when2meet': 'When2meet Inc.',
+    'scheduleonce': 'ScheduleOnce Inc.',
+    'appointy': 'Appointy Inc.',
+    'simplybook': 'SimplyBook.me Ltd.',
+    'bookly': 'Bookly Inc.',
+    'picktime': 'Picktime Inc.',
+    'reservio': 'Reservio Inc.',
+    'bookingbug': 'BookingBug Ltd.',
+    'infosys': 'Infosys Limited',
+    'tcs': 'Tata Consultancy Services',
+    'wipro': 'Wipro Limited',
+    'hcl': 'HCL Technologies',
+    'cognizant': 'Cognizant Technology Solutions',
+    'accenture': 'Accenture plc',
+    'capgemini': 'Capgemini SE',
+    'deloitte': 'Deloitte Touche Tohmatsu Limited',
+    'pwc': 'PricewaterhouseCoopers',
+    'kpmg': 'KPMG International',
+    'ey': 'Ernst & Young',
+    'sap': 'SAP SE'
+}
+
+# Every alias is a single alphanumeric word, so messages are matched token by token
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def lookup_company_name(message: str) -> Optional[str]:
+    """
+    Map a user message to a known company name.
+    Returns None when no alias matches.
+    """
+    message_lower = message.lower().strip()
+    if message_lower in COMPANY_MAPPINGS:
+        return COMPANY_MAPPINGS[message_lower]
+    
+    # Check each word of the message against the known aliases
+    for token in _TOKEN_RE.findall(message_lower):
+        if token in COMPANY_MAPPINGS:
+            return COMPANY_MAPPINGS[token]
+    return None
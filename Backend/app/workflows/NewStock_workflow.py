@@ -12,6 +12,7 @@ from app.prompts.marketing_signal_prompt import MARKETING_SIGNAL_PROMPT
 from app.prompts.leadership_change_prompt import LEADERSHIP_CHANGE_PROMPT
 from app.prompts.competitor_ad_spend_prompt import COMPETITOR_AD_SPEND_PROMPT
 from app.prompts.three_month_report_prompt import THREE_MONTH_REPORT_PROMPT
+from app.helpers.company_names import lookup_company_name
 from datetime import datetime
 import logging
 from phoenix.otel import register
@@ -77,6 +78,7 @@ class ReportGeneratedEvent(Event):
     user_query: str
     response: str
     propensity_score: float
+    company_name: str
 
 # Configuration and initialization
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
@@ -175,141 +177,6 @@ Keep the language professional, direct, and actionable for a business audience.
 """
 
 class NewStockWorkflow(Workflow):
-    def _extract_company_name(self, user_query: str) -> str:
-        """
-        Extract and normalize company name from user query.
-        Maps common variations to proper company names.
-        """
-        query_lower = user_query.lower().strip()
-        
-        # Company name mappings
-        company_mappings = {
-            'youtube': 'YouTube (Google)',
-            'google': 'Google (Alphabet Inc.)',
-            'alphabet': 'Alphabet Inc.',
-            'meta': 'Meta Platforms Inc.',
-            'facebook': 'Meta Platforms Inc.',
-            'apple': 'Apple Inc.',
-            'microsoft': 'Microsoft Corporation',
-            'amazon': 'Amazon.com Inc.',
-            'tesla': 'Tesla Inc.',
-            'nvidia': 'NVIDIA Corporation',
-            'netflix': 'Netflix Inc.',
-            'spotify': 'Spotify Technology S.A.',
-            'uber': 'Uber Technologies Inc.',
-            'airbnb': 'Airbnb Inc.',
-            'twitter': 'X (formerly Twitter)',
-            'x': 'X (formerly Twitter)',
-            'tiktok': 'TikTok (ByteDance)',
-            'bytedance': 'ByteDance Ltd.',
-            'snapchat': 'Snap Inc.',
-            'snap': 'Snap Inc.',
-            'pinterest': 'Pinterest Inc.',
-            'linkedin': 'LinkedIn (Microsoft)',
-            'salesforce': 'Salesforce Inc.',
-            'oracle': 'Oracle Corporation',
-            'ibm': 'IBM Corporation',
-            'intel': 'Intel Corporation',
-            'amd': 'Advanced Micro Devices Inc.',
-            'qualcomm': 'Qualcomm Inc.',
-            'cisco': 'Cisco Systems Inc.',
-            'adobe': 'Adobe Inc.',
-            'paypal': 'PayPal Holdings Inc.',
-            'square': 'Block Inc.',
-            'stripe': 'Stripe Inc.',
-            'zoom': 'Zoom Video Communications Inc.',
-            'slack': 'Slack Technologies Inc.',
-            'dropbox': 'Dropbox Inc.',
-            'box': 'Box Inc.',
-            'atlassian': 'Atlassian Corporation',
-            'servicenow': 'ServiceNow Inc.',
-            'workday': 'Workday Inc.',
-            'snowflake': 'Snowflake Inc.',
-            'databricks': 'Databricks Inc.',
-            'palantir': 'Palantir Technologies Inc.',
-            'crowdstrike': 'CrowdStrike Holdings Inc.',
-            'okta': 'Okta Inc.',
-            'zendesk': 'Zendesk Inc.',
-            'shopify': 'Shopify Inc.',
-            'square': 'Block Inc.',
-            'roku': 'Roku Inc.',
-            'peloton': 'Peloton Interactive Inc.',
-            'zoom': 'Zoom Video Communications Inc.',
-            'docu': 'DocuSign Inc.',
-            'docusign': 'DocuSign Inc.',
-            'twilio': 'Twilio Inc.',
-            'sendgrid': 'Twilio Inc.',
-            'mailchimp': 'Mailchimp (Intuit)',
-            'hubspot': 'HubSpot Inc.',
-            'salesforce': 'Salesforce Inc.',
-            'monday': 'Monday.com Ltd.',
-            'asana': 'Asana Inc.',
-            'trello': 'Atlassian Corporation',
-            'notion': 'Notion Labs Inc.',
-            'airtable': 'Airtable Inc.',
-            'figma': 'Figma Inc.',
-            'canva': 'Canva Pty Ltd.',
-            'grammarly': 'Grammarly Inc.',
-            'lastpass': 'LogMeIn Inc.',
-            '1password': '1Password Inc.',
-            'dashlane': 'Dashlane Inc.',
-            'bitwarden': 'Bitwarden Inc.',
-            'expressvpn': 'ExpressVPN (Kape Technologies)',
-            'nordvpn': 'NordVPN (Nord Security)',
-            'surfshark': 'Surfshark (Nord Security)',
-            'proton': 'Proton AG',
-            'protonmail': 'Proton AG',
-            'protonvpn': 'Proton AG',
-            'tutanota': 'Tutanota GmbH',
-            'signal': 'Signal Foundation',
-            'telegram': 'Telegram FZ-LLC',
-            'whatsapp': 'WhatsApp (Meta)',
-            'discord': 'Discord Inc.',
-            'teams': 'Microsoft Teams (Microsoft)',
-            'zoom': 'Zoom Video Communications Inc.',
-            'webex': 'Webex (Cisco)',
-            'gotomeeting': 'GoTo Meeting (LogMeIn)',
-            'bluejeans': 'BlueJeans (Verizon)',
-            'jitsi': 'Jitsi (8x8)',
-            'whereby': 'Whereby (Videxio AS)',
-            'calendly': 'Calendly Inc.',
-            'acuity': 'Acuity Scheduling Inc.',
-            'doodle': 'Doodle AG',
-            'when2meet': 'When2meet Inc.',
-            'calendly': 'Calendly Inc.',
-            'scheduleonce': 'ScheduleOnce Inc.',
-            'appointy': 'Appointy Inc.',
-            'simplybook': 'SimplyBook.me Ltd.',
-            'bookly': 'Bookly Inc.',
-            'picktime': 'Picktime Inc.',
-            'reservio': 'Reservio Inc.',
-            'bookingbug': 'BookingBug Ltd.',
-            'acuity': 'Acuity Scheduling Inc.',
-            'calendly': 'Calendly Inc.',
-            'doodle': 'Doodle AG',
-            'when2meet': 'When2meet Inc.',
-            'calendly': 'Calendly Inc.',
-            'scheduleonce': 'ScheduleOnce Inc.',
-            'appointy': 'Appointy Inc.',
-            'simplybook': 'SimplyBook.me Ltd.',
-            'bookly': 'Bookly Inc.',
-            'picktime': 'Picktime Inc.',
-            'reservio': 'Reservio Inc.',
-            'bookingbug': 'BookingBug Ltd.'
-        }
-        
-        # Check for exact matches first
-        if query_lower in company_mappings:
-            return company_mappings[query_lower]
-        
-        # Check for partial matches
-        for key, value in company_mappings.items():
-            if key in query_lower or query_lower in key:
-                return value
-        
-        # If no match found, capitalize and return the original query
-        return user_query.strip().title()
-    
     @step(pass_context=True)
     async def trigger_new_stock(self, ctx: Context, ev: StartEvent) -> MarketingSignalEvent | LeadershipChangeEvent | CompetitorAdSpendEvent | ThreeMonthReportEvent:
         """
@@ -459,8 +326,9 @@ class NewStockWorkflow(Workflow):
         """
         today = datetime.now().strftime('%B %d, %Y')
         
-        # Extract company name from user query
-        company_name = self._extract_company_name(ev.user_query)
+        # Extract company name from user query, falling back to the title-cased query;
+        # it is reported back to the caller so the route doesn't resolve it again
+        company_name = lookup_company_name(ev.user_query) or ev.user_query.strip().title()
         
         prompt = REPORT_PROMPT.format(
             company_name=company_name,
@@ -477,7 +345,8 @@ class NewStockWorkflow(Workflow):
             return ReportGeneratedEvent(
                 user_query=ev.user_query,
                 response=response.text.strip(),
-                propensity_score=ev.propensity_score
+                propensity_score=ev.propensity_score,
+                company_name=company_name
             )
         except Exception as e:
             error_response = f"Error in report generation: {str(e)}"
@@ -485,7 +354,8 @@ class NewStockWorkflow(Workflow):
             return ReportGeneratedEvent(
                 user_query=ev.user_query,
                 response=error_response,
-                propensity_score=ev.propensity_score
+                propensity_score=ev.propensity_score,
+                company_name=company_name
             )
 
     @step
@@ -520,7 +390,8 @@ class NewStockWorkflow(Workflow):
             "user_query": ev.user_query,
             "propensity_score": propensity_score,
             "score_category": score_category,
-            "visual_indicator": visual_indicator
+            "visual_indicator": visual_indicator,
+            "company_name": ev.company_name
         }
         print(f"Final answer step - Enhanced Response: {enhanced_response}")
         print(f"Final answer step - Result: {result}")
@@ -549,4 +420,7 @@ async def run_new_stock_workflow(user_query: str, user_id: str, message_id: str)
             "score_category": "Error",
             "visual_indicator": "🔴 Error"
         }
-        return type('Handler', (), {'result': fallback_result})()
\ No newline at end of file
+        # Resolve to the result dict just like an awaited workflow handler
+        fallback_handler = asyncio.get_running_loop().create_future()
+        fallback_handler.set_result(fallback_result)
+        return fallback_handler
\ No newline at end of file